@@ -6,20 +6,33 @@ Features: Progress tracking, Resume capability, Translation cache, News feed on
 """
 
 import os
+import re
 import json
 import random
 import time
 import sys
 import hashlib
+import functools
+import heapq
+import multiprocessing
+import queue
+import sqlite3
 import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import requests
-from bs4 import BeautifulSoup
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from deep_translator import GoogleTranslator
 from tqdm import tqdm
 try:
@@ -30,6 +43,11 @@ except ImportError:
     HAS_PANDAS = False
     # Increase CSV field size limit to handle large content fields
     csv.field_size_limit(sys.maxsize)
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 
 # Configuration
@@ -38,13 +56,25 @@ CSV_FILE = "posts_filtered_export.csv"
 OUTPUT_DIR = "output"
 TEMPLATES_DIR = "templates"
 CACHE_DIR = ".cache"
+CACHE_DB = os.path.join(CACHE_DIR, "translations.db")
+JINJA_CACHE_DIR = os.path.join(CACHE_DIR, "jinja")
 PROGRESS_FILE = ".progress.json"
+PROGRESS_LOG = ".progress.jsonl"  # Append-only log of entries since the last compaction
 MAX_RETRIES = 5
 RETRY_DELAY = 3  # seconds
-TRANSLATION_DELAY = 1.0  # Delay between translations to avoid rate limiting (optimized for large batches)
+TRANSLATION_RATE = 10.0  # Max translation requests per second (shared by all threads)
+TRANSLATION_BURST = 20  # Requests allowed back-to-back before rate limiting kicks in
+TRANSLATION_BATCH_SIZE = 50  # Max strings translated per batch
+CACHE_WRITE_BATCH = 128  # Max cache rows committed per SQLite transaction
+TRANSLATION_MEMO_CHARS = 4000000  # Total characters of recent translations kept in memory in front of the SQLite cache
+MAX_CHUNK_LENGTH = 4000  # Google Translate limit per request
 REQUEST_TIMEOUT = 60  # seconds
 PROGRESS_SAVE_INTERVAL = 10  # Save progress every N articles (to reduce I/O)
-MAX_WORKERS = 10  # Number of parallel threads for processing
+PROGRESS_BAR_INTERVAL = 0.5  # Min seconds between progress bar redraws
+PROGRESS_BAR_BATCH = 50  # Items counted locally before updating a progress bar in tight loops
+MAX_WORKERS = 32  # Articles in flight at once; threads mostly wait on translation I/O, the request rate is capped by TRANSLATION_RATE
+CPU_WORKERS = os.cpu_count() or 1  # Number of worker processes for HTML parsing/rendering
+RENDER_BATCH_SIZE = 25  # Articles rendered per worker-process task
 
 # Supported languages
 LANGUAGES = {
@@ -60,14 +90,67 @@ LANGUAGES = {
     }
 }
 
+# Per-language page text (section title on article pages, heading and meta on the language index)
+LANG_META = {
+    'en': {
+        'related_title': "Read Also",
+        'page_title': "Educational Articles",
+        'page_description': "Articles and news about education in Uzbekistan",
+        'meta_description': "Educational articles and news from Uzbekistan"
+    },
+    'ru': {
+        'related_title': "Читайте также",
+        'page_title': "Образовательные статьи",
+        'page_description': "Статьи и новости об образовании в Узбекистане",
+        'meta_description': "Образовательные статьи и новости из Узбекистана"
+    }
+}
+
 # Internal linking configuration
 MIN_INTERNAL_LINKS = 5
 MAX_INTERNAL_LINKS = 10
 
+# Backlink configuration
+BACKLINK_SEED = None  # Set to an int for reproducible backlink assignment
+
 # News feed configuration
 LATEST_ARTICLES_COUNT = 12  # Number of latest articles to show on landing page
 
 
+# Jinja2 environment shared by the whole build.
+# Templates are compiled once per process; compiled bytecode is also cached on disk across runs.
+jinja_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    # Autoescape is off: templates escape the translated text fields explicitly with |e,
+    # so trusted values (article HTML, fixed labels) skip the per-variable escape scan
+    autoescape=False,
+    auto_reload=False,
+    cache_size=400,
+    bytecode_cache=FileSystemBytecodeCache(directory=JINJA_CACHE_DIR)
+)
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a requests session with keep-alive connection pooling and automatic retries.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504)
+    )
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+# Shared HTTP session (reuses TCP/TLS connections across requests)
+http_session = create_http_session()
+
+
 def setup_directories():
     """Create necessary directories if they don't exist."""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -75,64 +158,224 @@ def setup_directories():
     os.makedirs(os.path.join(OUTPUT_DIR, 'ru'), exist_ok=True)
     os.makedirs(TEMPLATES_DIR, exist_ok=True)
     os.makedirs(CACHE_DIR, exist_ok=True)
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
 
 
-def get_cache_key(text: str, target_lang: str) -> str:
+def get_cache_key(text: str, target_lang: str) -> bytes:
     """Generate cache key for translation."""
-    content_hash = hashlib.md5(f"{text}_{target_lang}".encode('utf-8')).hexdigest()
-    return os.path.join(CACHE_DIR, f"trans_{target_lang}_{content_hash}.json")
+    # Keyed BLAKE2b: the language is the key, so the text is hashed without concatenation
+    return hashlib.blake2b(text.encode('utf-8'), key=target_lang.encode('utf-8'), digest_size=16).digest()
+
+
+# One SQLite connection per thread (opened lazily)
+_cache_local = threading.local()
 
+def get_cache_db() -> sqlite3.Connection:
+    """Return this thread's connection to the translation cache database."""
+    conn = getattr(_cache_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(CACHE_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "hash BLOB PRIMARY KEY, lang TEXT NOT NULL, translated TEXT NOT NULL)"
+        )
+        _cache_local.conn = conn
+    return conn
+
+
+# In-memory LRU of recent translations, keyed like the database. It answers repeats without
+# a query and covers entries still waiting in the writer queue (not yet visible in SQLite).
+_translation_memo = OrderedDict()
+_translation_memo_chars = 0
+_translation_memo_lock = threading.Lock()
+
+def remember_translation(key: bytes, translated: str):
+    """Add a translation to the in-memory LRU, evicting the oldest entries past TRANSLATION_MEMO_CHARS."""
+    global _translation_memo_chars
+    if len(translated) > TRANSLATION_MEMO_CHARS:
+        return
+    
+    with _translation_memo_lock:
+        previous = _translation_memo.pop(key, None)
+        if previous is not None:
+            _translation_memo_chars -= len(previous)
+        _translation_memo[key] = translated
+        _translation_memo_chars += len(translated)
+        while _translation_memo_chars > TRANSLATION_MEMO_CHARS:
+            _, evicted = _translation_memo.popitem(last=False)
+            _translation_memo_chars -= len(evicted)
 
-# Cache lock for thread-safe cache operations
-cache_lock = threading.Lock()
 
 def load_from_cache(text: str, target_lang: str) -> Optional[str]:
     """Load translation from cache if exists (thread-safe)."""
-    cache_file = get_cache_key(text, target_lang)
-    if os.path.exists(cache_file):
-        try:
-            with cache_lock:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('translated')
-        except:
-            return None
+    key = get_cache_key(text, target_lang)
+    with _translation_memo_lock:
+        translated = _translation_memo.get(key)
+        if translated is not None:
+            _translation_memo.move_to_end(key)
+            return translated
+    
+    try:
+        row = get_cache_db().execute(
+            "SELECT translated FROM translations WHERE hash = ?", (key,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    
+    if row:
+        remember_translation(key, row[0])
+        return row[0]
     return None
 
 
-def save_to_cache(text: str, target_lang: str, translated: str):
-    """Save translation to cache (thread-safe)."""
-    cache_file = get_cache_key(text, target_lang)
+# Cache writes are queued and committed in batches by a single writer thread
+_cache_queue = queue.Queue()
+_cache_writer_lock = threading.Lock()
+_cache_writer = None
+
+def cache_writer_loop():
+    """
+    Drain queued cache entries, committing up to CACHE_WRITE_BATCH rows per transaction.
+    Every entry is marked done even if it could not be written, so flush_cache_writes() never hangs.
+    """
     try:
-        with cache_lock:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump({'original': text[:100], 'translated': translated}, f, ensure_ascii=False)
-    except:
-        pass
+        conn = get_cache_db()
+    except Exception as e:
+        # Keep draining so the build goes on without the cache instead of blocking on join()
+        print(f"[WARNING] Could not open translation cache, new translations won't be saved: {e}")
+        conn = None
+    
+    while True:
+        batch = [_cache_queue.get()]
+        while len(batch) < CACHE_WRITE_BATCH:
+            try:
+                batch.append(_cache_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            if conn is not None:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO translations (hash, lang, translated) VALUES (?, ?, ?)",
+                        batch
+                    )
+        except Exception as e:
+            print(f"[WARNING] Could not write {len(batch)} cache entries: {e}")
+        finally:
+            for _ in batch:
+                _cache_queue.task_done()
+
+
+def save_to_cache(text: str, target_lang: str, translated: str):
+    """Queue a translation for the cache writer thread (non-blocking, thread-safe)."""
+    global _cache_writer
+    if _cache_writer is None:
+        with _cache_writer_lock:
+            if _cache_writer is None:
+                _cache_writer = threading.Thread(target=cache_writer_loop, name="cache-writer", daemon=True)
+                _cache_writer.start()
+    
+    key = get_cache_key(text, target_lang)
+    remember_translation(key, translated)
+    _cache_queue.put_nowait((key, target_lang, translated))
+
+
+def flush_cache_writes():
+    """Block until every queued cache entry has been committed."""
+    if _cache_writer is not None:
+        _cache_queue.join()
+
+
+# Digest of the last snapshot written (or loaded), to skip no-op rewrites
+_last_progress_hash = None
+
+def dumps_json(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed, same output as json otherwise)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        obj, ensure_ascii=False, indent=2 if indent else None,
+        separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads_json(data: bytes):
+    """Parse JSON bytes (orjson when installed)."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
 
 
 def load_progress() -> Dict:
-    """Load progress from file."""
+    """Load progress: the compacted snapshot plus any entries appended to the log since."""
+    global _last_progress_hash
+    progress = {}
     if os.path.exists(PROGRESS_FILE):
         try:
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(PROGRESS_FILE, 'rb') as f:
+                payload = f.read()
+            progress = loads_json(payload)
+            _last_progress_hash = hashlib.blake2b(payload, digest_size=8).digest()
         except:
-            return {}
-    return {}
+            progress = {}
+    
+    if os.path.exists(PROGRESS_LOG):
+        try:
+            with open(PROGRESS_LOG, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = loads_json(line)
+                    except ValueError:
+                        continue  # Partially written line from an interrupted run
+                    progress.setdefault(entry['lang'], {})[str(entry['idx'])] = entry['data']
+        except OSError as e:
+            print(f"[WARNING] Could not read progress log: {e}")
+    
+    return progress
+
+
+# Serialized progress entries waiting to be appended to PROGRESS_LOG.
+# Progress is only updated from the main thread (workers return their results),
+# so neither this list nor the progress dict needs a lock.
+pending_progress = []
+
+def record_progress(progress: Dict, lang_code: str, post_index: int, data: Dict):
+    """Update progress in memory and queue the entry for the progress log."""
+    progress[lang_code][str(post_index)] = data
+    pending_progress.append(dumps_json({'lang': lang_code, 'idx': post_index, 'data': data}))
+
 
+def flush_progress_log():
+    """Append queued progress entries to the log in a single write."""
+    if not pending_progress:
+        return
+    payload = b'\n'.join(pending_progress) + b'\n'
+    pending_progress.clear()
+    
+    try:
+        with open(PROGRESS_LOG, 'ab') as f:
+            f.write(payload)
+    except Exception as e:
+        print(f"[WARNING] Could not save progress: {e}")
 
-# Thread-safe locks (defined before functions that use them)
-progress_lock = threading.Lock()
-file_write_lock = threading.Lock()
-latest_articles_lock = threading.Lock()
 
 def save_progress(progress: Dict):
-    """Save progress to file (thread-safe)."""
+    """Compact progress: atomically rewrite the full snapshot and truncate the log."""
+    global _last_progress_hash
+    flush_progress_log()
     try:
-        with progress_lock:
-            with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, ensure_ascii=False, indent=2)
+        payload = dumps_json(progress, indent=True)
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        if digest != _last_progress_hash or not os.path.exists(PROGRESS_FILE):
+            # Write to a temp file and swap it in, so a crash never leaves a truncated snapshot
+            tmp_file = PROGRESS_FILE + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, PROGRESS_FILE)
+            _last_progress_hash = digest
+        if os.path.exists(PROGRESS_LOG):
+            os.remove(PROGRESS_LOG)
     except Exception as e:
         print(f"[WARNING] Could not save progress: {e}")
 
@@ -161,69 +404,98 @@ def fetch_sitemap_urls(sitemap_url: str, cache_file: str = None) -> List[str]:
     cache_file = cache_file or os.path.join(CACHE_DIR, 'sitemap_urls.json')
     
     # Try to load from cache first
+    cached_data = {}
     if os.path.exists(cache_file):
         try:
             with open(cache_file, 'r', encoding='utf-8') as f:
                 cached_data = json.load(f)
-                # Cache valid for 24 hours
-                if time.time() - cached_data.get('timestamp', 0) < 86400:
-                    print(f"[OK] Loaded {len(cached_data.get('urls', []))} URLs from cache")
-                    return cached_data.get('urls', [])
         except:
-            pass
+            cached_data = {}
+    
+    # Cache valid for 24 hours
+    if cached_data and time.time() - cached_data.get('timestamp', 0) < 86400:
+        print(f"[OK] Loaded {len(cached_data.get('urls', []))} URLs from cache")
+        return cached_data.get('urls', [])
+    
+    # Stale cache: revalidate instead of re-downloading if the sitemap hasn't changed
+    headers = {}
+    if cached_data.get('etag'):
+        headers['If-None-Match'] = cached_data['etag']
+    if cached_data.get('last_modified'):
+        headers['If-Modified-Since'] = cached_data['last_modified']
     
     print(f"Fetching sitemap from {sitemap_url}...")
     
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.get(sitemap_url, timeout=REQUEST_TIMEOUT)
+    # Retries with backoff are handled by the session's HTTPAdapter
+    try:
+        with http_session.get(sitemap_url, timeout=REQUEST_TIMEOUT, stream=True, headers=headers) as response:
+            if response.status_code == 304 and 'urls' in cached_data:
+                urls = cached_data['urls']
+                cached_data['timestamp'] = time.time()
+                try:
+                    with open(cache_file, 'w', encoding='utf-8') as f:
+                        json.dump(cached_data, f)
+                except:
+                    pass
+                print(f"[OK] Sitemap not modified, reusing {len(urls)} cached URLs")
+                return urls
+            
             response.raise_for_status()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            response.raw.decode_content = True  # Transparently gunzip
             
-            # Parse XML
-            soup = BeautifulSoup(response.content, 'xml')
+            # Parse XML while it downloads, in a single pass over all <loc> tags (any namespace)
             urls = []
-            
-            # Find all <loc> tags in the sitemap
-            for loc in soup.find_all('loc'):
-                url = loc.get_text(strip=True)
+            for _, loc in etree.iterparse(response.raw, events=('end',), tag='{*}loc'):
+                url = (loc.text or '').strip()
                 if url:
                     urls.append(url)
-            
-            # Save to cache
-            try:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump({'urls': urls, 'timestamp': time.time()}, f)
-            except:
-                pass
-            
-            print(f"[OK] Found {len(urls)} URLs in sitemap")
-            return urls
-            
-        except requests.exceptions.Timeout:
-            print(f"[ERROR] Timeout (attempt {attempt + 1}/{MAX_RETRIES})")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-        except requests.exceptions.ConnectionError:
-            print(f"[ERROR] Connection error (attempt {attempt + 1}/{MAX_RETRIES})")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-            else:
-                print("[WARNING] Could not fetch sitemap. Using cached data if available.")
-                # Try to return cached data even if old
-                if os.path.exists(cache_file):
-                    try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            cached_data = json.load(f)
-                            return cached_data.get('urls', [])
-                    except:
-                        pass
-                return []
-    
-    return []
+                loc.clear()  # Free parsed nodes as we go
+        
+        # Save to cache
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'urls': urls,
+                    'timestamp': time.time(),
+                    'etag': etag,
+                    'last_modified': last_modified
+                }, f)
+        except:
+            pass
+        
+        print(f"[OK] Found {len(urls)} URLs in sitemap")
+        return urls
+        
+    except requests.exceptions.Timeout:
+        print(f"[ERROR] Timeout after {MAX_RETRIES} retries")
+    except requests.exceptions.ConnectionError:
+        print(f"[ERROR] Connection error after {MAX_RETRIES} retries")
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR] Could not fetch sitemap: {e}")
+    except (urllib3.exceptions.HTTPError, etree.XMLSyntaxError) as e:
+        # Connection dropped or the body was cut off while streaming
+        print(f"[ERROR] Could not read sitemap: {e}")
+    
+    print("[WARNING] Could not fetch sitemap. Using cached data if available.")
+    # Fall back to cached data even if old
+    return cached_data.get('urls', [])
+
+
+def parse_fragment(content: str):
+    """
+    Parse an HTML fragment with lxml (C-backed) into a wrapper <div> element.
+    """
+    return lxml_html.fragment_fromstring(content, create_parent='div')
+
+
+def fragment_to_html(root) -> str:
+    """
+    Serialize a wrapper element from parse_fragment() back to an HTML fragment string.
+    """
+    # Strip the "<div>" / "</div>" added by parse_fragment()
+    return lxml_html.tostring(root, encoding='unicode')[5:-6]
 
 
 def clean_content(content: str) -> str:
@@ -234,119 +506,71 @@ def clean_content(content: str) -> str:
     if not content:
         return ""
     
-    soup = BeautifulSoup(content, 'html.parser')
+    root = parse_fragment(content)
     
     # Find all <a> tags and unwrap them (removes tag but keeps text)
-    for anchor in soup.find_all('a'):
-        anchor.unwrap()
+    for anchor in root.findall('.//a'):
+        anchor.drop_tag()
     
-    return str(soup)
+    return fragment_to_html(root)
 
 
-def translate_text(text: str, source_lang: str = 'uz', target_lang: str = 'en', use_cache: bool = True, recursion_depth: int = 0) -> str:
+class TokenBucket:
     """
-    Translate text from Uzbek to target language using deep-translator.
-    Uses cache to avoid re-translating same content.
-    Handles timeouts and errors with retries.
-    Prevents infinite recursion by limiting recursion depth.
+    Thread-safe token bucket rate limiter.
+    Tokens refill at `rate` per second up to `burst`; acquire() only blocks when the bucket is empty.
     """
-    # Prevent infinite recursion
-    MAX_RECURSION_DEPTH = 10
-    if recursion_depth > MAX_RECURSION_DEPTH:
-        print(f"[WARNING] Maximum recursion depth reached. Returning original text.")
-        return text
-    
-    if not text or not text.strip():
-        return text
-    
-    # Check cache first
-    if use_cache:
-        cached = load_from_cache(text, target_lang)
-        if cached:
-            return cached
-    
-    # Clean text for translation
-    text_clean = ' '.join(text.split())
-    
-    # If text is too long, split it into chunks (iterative approach to avoid deep recursion)
-    max_chunk_length = 4000  # Google Translate limit
-    if len(text_clean) > max_chunk_length:
-        # Split by sentences first
-        sentences = text_clean.split('. ')
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            sentence_with_dot = sentence + ". "
-            # If adding this sentence would exceed limit, save current chunk and start new
-            if len(current_chunk) + len(sentence_with_dot) > max_chunk_length:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                # If single sentence is too long, split by words
-                if len(sentence) > max_chunk_length:
-                    # Split long sentence by words
-                    words = sentence.split()
-                    word_chunk = ""
-                    for word in words:
-                        if len(word_chunk) + len(word) + 1 > max_chunk_length:
-                            if word_chunk:
-                                chunks.append(word_chunk.strip())
-                            word_chunk = word + " "
-                        else:
-                            word_chunk += word + " "
-                    if word_chunk:
-                        current_chunk = word_chunk
-                else:
-                    current_chunk = sentence_with_dot
-            else:
-                current_chunk += sentence_with_dot
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        # If still no chunks (very edge case), force split by character
-        if not chunks:
-            chunks = [text_clean[i:i+max_chunk_length] for i in range(0, len(text_clean), max_chunk_length)]
-        
-        # Translate each chunk iteratively (not recursively to avoid stack overflow)
-        translated_chunks = []
-        for chunk in chunks:
-            # Use iterative translation for chunks (no recursion)
-            chunk_result = translate_text_single(chunk, source_lang, target_lang, use_cache)
-            translated_chunks.append(chunk_result)
-            time.sleep(TRANSLATION_DELAY)  # Delay between chunks
-        
-        result = " ".join(translated_chunks)
-        if use_cache:
-            save_to_cache(text, target_lang, result)
-        return result
     
-    # For short texts, translate directly
-    return translate_text_single(text_clean, source_lang, target_lang, use_cache)
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve the token now; a negative balance is the queue of waiting callers
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 
-def translate_text_single(text: str, source_lang: str, target_lang: str, use_cache: bool = True) -> str:
+# Shared by all threads so the total request rate matches the provider limit
+translation_rate_limiter = TokenBucket(TRANSLATION_RATE, TRANSLATION_BURST)
+
+
+# GoogleTranslator mutates its URL params on every call, so instances are reused per thread only
+_translator_local = threading.local()
+
+def get_translator(source_lang: str, target_lang: str) -> GoogleTranslator:
+    """Return this thread's translator for a language pair (created on first use)."""
+    translators = getattr(_translator_local, 'translators', None)
+    if translators is None:
+        translators = _translator_local.translators = {}
+    
+    translator = translators.get((source_lang, target_lang))
+    if translator is None:
+        translator = translators[(source_lang, target_lang)] = GoogleTranslator(source=source_lang, target=target_lang)
+    return translator
+
+
+def request_translation(text: str, source_lang: str, target_lang: str) -> Optional[str]:
     """
-    Translate a single chunk of text (non-recursive helper function).
+    Send a single translation request with retries.
+    Returns None if the text could not be translated.
     """
-    if not text or not text.strip():
-        return text
-    
-    # Check cache first
-    if use_cache:
-        cached = load_from_cache(text, target_lang)
-        if cached:
-            return cached
-    
     for attempt in range(MAX_RETRIES):
         try:
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            translated = translator.translate(text)
+            translation_rate_limiter.acquire()
+            translated = get_translator(source_lang, target_lang).translate(text)
             
             if translated and translated != text:
-                if use_cache:
-                    save_to_cache(text, target_lang, translated)
-                time.sleep(TRANSLATION_DELAY)  # Rate limiting
                 return translated
             else:
                 if attempt < MAX_RETRIES - 1:
@@ -369,9 +593,192 @@ def translate_text_single(text: str, source_lang: str, target_lang: str, use_cac
                 time.sleep(wait_time)
             else:
                 print(f"[ERROR] Failed to translate after {MAX_RETRIES} attempts. Using original text.")
-                return text
+                return None
     
-    return text
+    return None
+
+
+class BatchTranslator:
+    """
+    Collects pending strings per (source, target) language pair and translates them in batches.
+    Strings are packed into as few requests as MAX_CHUNK_LENGTH allows (joined by newlines),
+    so many short titles/chunks share one HTTP round-trip and one rate-limit token.
+    """
+    
+    SEPARATOR = "\n"
+    
+    def __init__(self, batch_size: int = TRANSLATION_BATCH_SIZE, max_chars: int = MAX_CHUNK_LENGTH):
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, Future, bool]]] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, text: str, source_lang: str, target_lang: str, use_cache: bool = True) -> Future:
+        """Queue text for translation. Returns a Future resolved on the next flush()."""
+        future = Future()
+        if not text or not text.strip():
+            future.set_result(text)
+            return future
+        
+        if use_cache:
+            cached = load_from_cache(text, target_lang)
+            if cached:
+                future.set_result(cached)
+                return future
+        
+        with self._lock:
+            self._pending.setdefault((source_lang, target_lang), []).append((text, future, use_cache))
+        return future
+    
+    def flush(self):
+        """
+        Translate everything pending, one batch at a time.
+        Other threads' pending strings are drained too, so their Futures may be
+        resolved by whichever thread flushes first.
+        """
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                langs, items = next(iter(self._pending.items()))
+                batch, rest = items[:self.batch_size], items[self.batch_size:]
+                if rest:
+                    self._pending[langs] = rest
+                else:
+                    del self._pending[langs]
+            self._translate_batch(langs, batch)
+    
+    def _pack(self, batch: List[Tuple[str, Future, bool]]) -> List[List[Tuple[str, Future, bool]]]:
+        """Group batch items into request payloads no longer than max_chars."""
+        groups = []
+        group = []
+        size = 0
+        for item in batch:
+            text = item[0]
+            # Text containing the separator can't be split back reliably; send it alone
+            if self.SEPARATOR in text:
+                groups.append([item])
+                continue
+            extra = len(text) + (len(self.SEPARATOR) if group else 0)
+            if group and size + extra > self.max_chars:
+                groups.append(group)
+                group = []
+                size = 0
+                extra = len(text)
+            group.append(item)
+            size += extra
+        if group:
+            groups.append(group)
+        return groups
+    
+    def _translate_batch(self, langs: Tuple[str, str], batch: List[Tuple[str, Future, bool]]):
+        """Translate one batch and fan the results out to its Futures."""
+        source_lang, target_lang = langs
+        try:
+            for group in self._pack(batch):
+                texts = [text for text, _, _ in group]
+                results = None
+                
+                if len(group) > 1:
+                    translated = request_translation(self.SEPARATOR.join(texts), source_lang, target_lang)
+                    if translated:
+                        parts = translated.split(self.SEPARATOR)
+                        if len(parts) == len(group):
+                            results = [part.strip() for part in parts]
+                
+                # Single item, or the packed response didn't split back cleanly
+                if results is None:
+                    results = [request_translation(text, source_lang, target_lang) for text in texts]
+                
+                for (text, future, use_cache), translated in zip(group, results):
+                    if translated and translated != text:
+                        if use_cache:
+                            save_to_cache(text, target_lang, translated)
+                        future.set_result(translated)
+                    else:
+                        future.set_result(text)
+            
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+# Shared by all worker threads so their pending strings can be batched together
+batch_translator = BatchTranslator()
+
+
+def iter_chunks(text: str, limit: int = MAX_CHUNK_LENGTH):
+    """
+    Yield consecutive pieces of text no longer than limit characters, in one pass.
+    Each piece ends at the last sentence boundary ('. ') in its window if there is one,
+    otherwise at the last space, otherwise exactly at the limit.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start + limit
+        if end >= length:
+            end = length
+        else:
+            cut = text.rfind('. ', start, end)
+            if cut > start:
+                end = cut + 1  # Keep the period with its sentence
+            else:
+                cut = text.rfind(' ', start, end)
+                if cut > start:
+                    end = cut
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        start = end
+
+
+def queue_translation(text: str, source_lang: str = 'uz', target_lang: str = 'en', use_cache: bool = True) -> Callable[[], str]:
+    """
+    Queue text on batch_translator without flushing it.
+    Long texts are split into chunks that all join the same batch.
+    Returns a function that gives the translation once batch_translator has been flushed.
+    """
+    if not text or not text.strip():
+        return lambda: text
+    
+    # Clean text for translation
+    text_clean = ' '.join(text.split())
+    
+    # Short texts are one batch item (the cache is checked in submit)
+    if len(text_clean) <= MAX_CHUNK_LENGTH:
+        return batch_translator.submit(text_clean, source_lang, target_lang, use_cache).result
+    
+    # Check cache for the full text first (each chunk is looked up separately below)
+    if use_cache:
+        cached = load_from_cache(text, target_lang)
+        if cached:
+            return lambda: cached
+    
+    futures = [
+        batch_translator.submit(chunk, source_lang, target_lang, use_cache)
+        for chunk in iter_chunks(text_clean)
+    ]
+    
+    def collect() -> str:
+        result = " ".join(future.result() for future in futures)
+        if use_cache:
+            save_to_cache(text, target_lang, result)
+        return result
+    
+    return collect
+
+
+def translate_text(text: str, source_lang: str = 'uz', target_lang: str = 'en', use_cache: bool = True) -> str:
+    """
+    Translate text from Uzbek to target language using deep-translator.
+    Uses cache to avoid re-translating same content.
+    To share one batch between several texts, queue them with queue_translation() and flush once.
+    """
+    result = queue_translation(text, source_lang, target_lang, use_cache)
+    batch_translator.flush()
+    return result()
 
 
 def inject_backlink(content: str, target_url: str, anchor_text: str, lang: str) -> str:
@@ -382,30 +789,38 @@ def inject_backlink(content: str, target_url: str, anchor_text: str, lang: str)
     if not content or not target_url:
         return content
     
-    soup = BeautifulSoup(content, 'html.parser')
-    
+    root = parse_fragment(content)
+    append_backlink(root, target_url, anchor_text, lang)
+    return fragment_to_html(root)
+
+
+def append_backlink(root, target_url: str, anchor_text: str, lang: str):
+    """
+    Add the backlink to a parsed fragment in place (see inject_backlink).
+    """
     # Create the backlink
-    backlink = soup.new_tag('a', href=target_url, rel='dofollow')
-    backlink.string = anchor_text
+    backlink = lxml_html.Element('a', href=target_url, rel='dofollow')
+    backlink.text = anchor_text
     
     # Try to find the last paragraph
-    paragraphs = soup.find_all('p')
+    paragraphs = root.findall('.//p')
     if paragraphs:
         # Append to last paragraph
         last_p = paragraphs[-1]
-        last_p.append(" — ")
+        if len(last_p):
+            last_p[-1].tail = (last_p[-1].tail or '') + " — "
+        else:
+            last_p.text = (last_p.text or '') + " — "
         last_p.append(backlink)
     else:
         # If no paragraphs, append as a new paragraph at the end
-        new_p = soup.new_tag('p')
+        new_p = lxml_html.Element('p')
         if lang == 'ru':
-            new_p.append("Источник: ")
+            new_p.text = "Источник: "
         else:
-            new_p.append("Source: ")
+            new_p.text = "Source: "
         new_p.append(backlink)
-        soup.append(new_p)
-    
-    return str(soup)
+        root.append(new_p)
 
 
 def extract_meta_description(content: str, max_length: int = 160) -> str:
@@ -415,9 +830,20 @@ def extract_meta_description(content: str, max_length: int = 160) -> str:
     if not content:
         return ""
     
-    soup = BeautifulSoup(content, 'html.parser')
-    text = soup.get_text(strip=True)
-    
+    return truncate_meta_description(fragment_text(parse_fragment(content)), max_length)
+
+
+def fragment_text(root) -> str:
+    """
+    Plain text of a parsed fragment with whitespace collapsed.
+    """
+    return ' '.join(' '.join(root.itertext()).split())
+
+
+def truncate_meta_description(text: str, max_length: int = 160) -> str:
+    """
+    Shorten plain text to a meta description, preferring a sentence boundary.
+    """
     # Take first max_length characters
     if len(text) > max_length:
         # Try to cut at sentence boundary
@@ -446,13 +872,14 @@ def read_posts_csv(csv_file: str) -> List[Dict]:
     try:
         if HAS_PANDAS:
             # Try using pandas first for better CSV handling
-            df = pd.read_csv(csv_file)
+            # Read only the header first to map column names
+            columns = list(pd.read_csv(csv_file, nrows=0).columns)
             
             # Map column names (handle variations)
             title_col = None
             content_col = None
             
-            for col in df.columns:
+            for col in columns:
                 col_lower = col.lower()
                 if 'title' in col_lower and not title_col:
                     title_col = col
@@ -461,18 +888,23 @@ def read_posts_csv(csv_file: str) -> List[Dict]:
             
             if not title_col or not content_col:
                 print(f"[ERROR] Could not find 'title' and 'content' columns in CSV")
-                print(f"Available columns: {list(df.columns)}")
+                print(f"Available columns: {columns}")
                 sys.exit(1)
             
-            for _, row in df.iterrows():
-                title = str(row[title_col]) if pd.notna(row[title_col]) else ""
-                content = str(row[content_col]) if pd.notna(row[content_col]) else ""
-                
-                if title and content:
-                    posts.append({
-                        'title': title,
-                        'content': content
-                    })
+            # Load just the two needed columns as plain strings (no dtype inference, no NaN)
+            df = pd.read_csv(
+                csv_file,
+                usecols=[title_col, content_col],
+                dtype=str,
+                keep_default_na=False,
+                engine='c'
+            )
+            
+            posts = [
+                {'title': title, 'content': content}
+                for title, content in zip(df[title_col].tolist(), df[content_col].tolist())
+                if title and content
+            ]
         else:
             # Use standard csv module
             # Increase field size limit to handle large content
@@ -484,33 +916,37 @@ def read_posts_csv(csv_file: str) -> List[Dict]:
                 except OverflowError:
                     max_int = int(max_int / 10)
             
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                # Positional reader: map the header once, then index rows by column position
+                reader = csv.reader(f)
+                header = next(reader, None)
                 
-                if not rows:
+                if not header:
                     print("[ERROR] CSV file is empty")
                     sys.exit(1)
                 
                 # Map column names (handle variations)
-                title_col = None
-                content_col = None
+                title_idx = None
+                content_idx = None
                 
-                for col in rows[0].keys():
+                for i, col in enumerate(header):
                     col_lower = col.lower()
-                    if 'title' in col_lower and not title_col:
-                        title_col = col
-                    if 'content' in col_lower and not content_col:
-                        content_col = col
+                    if 'title' in col_lower and title_idx is None:
+                        title_idx = i
+                    if 'content' in col_lower and content_idx is None:
+                        content_idx = i
                 
-                if not title_col or not content_col:
+                if title_idx is None or content_idx is None:
                     print(f"[ERROR] Could not find 'title' and 'content' columns in CSV")
-                    print(f"Available columns: {list(rows[0].keys())}")
+                    print(f"Available columns: {header}")
                     sys.exit(1)
                 
-                for row in rows:
-                    title = str(row.get(title_col, '')).strip()
-                    content = str(row.get(content_col, '')).strip()
+                min_len = max(title_idx, content_idx) + 1
+                for row in reader:
+                    if len(row) < min_len:
+                        continue
+                    title = row[title_idx].strip()
+                    content = row[content_idx].strip()
                     
                     if title and content:
                         posts.append({
@@ -528,72 +964,87 @@ def read_posts_csv(csv_file: str) -> List[Dict]:
         sys.exit(1)
 
 
+# Slug patterns (compiled once)
+SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+SLUG_DASH_RE = re.compile(r'[-\s]+')
+SLUG_DASH_RUN_RE = re.compile(r'-{2,}')
+
+# ASCII fast path: whitespace becomes '-', chars outside [\w\s-] are dropped.
+# Built from the regexes above so both paths produce identical slugs.
+SLUG_ASCII_TABLE = {
+    i: ('-' if SLUG_DASH_RE.match(chr(i)) else None)
+    for i in range(128)
+    if SLUG_STRIP_RE.match(chr(i)) or SLUG_DASH_RE.match(chr(i))
+}
+
+
 def generate_slug(title: str) -> str:
     """
     Generate a URL-friendly slug from title.
     """
-    import re
+    if title.isascii():
+        # Single translate() pass, then collapse the hyphen runs it leaves behind
+        slug = title.lower().translate(SLUG_ASCII_TABLE)
+        if '--' in slug:
+            slug = SLUG_DASH_RUN_RE.sub('-', slug)
+        return slug[:100]
+    
     # Convert to lowercase and replace spaces/special chars with hyphens
-    slug = re.sub(r'[^\w\s-]', '', title.lower())
-    slug = re.sub(r'[-\s]+', '-', slug)
+    slug = SLUG_STRIP_RE.sub('', title.lower())
+    slug = SLUG_DASH_RE.sub('-', slug)
     return slug[:100]  # Limit length
 
 
-def generate_sitemap(all_processed_posts: Dict, base_url: str = "https://yoursite.com") -> str:
+def generate_sitemap(all_processed_posts: Dict, sitemap_path: str, base_url: str = "https://yoursite.com") -> int:
     """
     Generate sitemap.xml file with all articles and index pages.
-    Returns the XML content as a string.
+    Streams the XML straight to sitemap_path and returns the number of URLs written.
     """
-    from datetime import datetime
-    
-    urls = []
     current_date = datetime.now().strftime('%Y-%m-%d')
     
-    # Add landing page
-    urls.append({
-        'loc': base_url,
-        'lastmod': current_date,
-        'changefreq': 'daily',
-        'priority': '1.0'
-    })
-    
-    # Add language index pages and articles
-    for lang_code, lang_config in LANGUAGES.items():
-        # Add language index page
-        urls.append({
-            'loc': f"{base_url}/{lang_code}/",
-            'lastmod': current_date,
-            'changefreq': 'daily',
-            'priority': '0.9'
-        })
-        
-        # Add all articles for this language
-        if lang_code in all_processed_posts:
-            for post in all_processed_posts[lang_code]:
-                urls.append({
-                    'loc': f"{base_url}/{lang_code}/{post.get('url_path', post['filename'].replace('.html', ''))}",
-                    'lastmod': current_date,
-                    'changefreq': 'weekly',
-                    'priority': '0.8'
-                })
-    
-    # Generate XML
-    xml_lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    def iter_urls():
+        # Landing page
+        yield base_url, 'daily', '1.0'
+        # Language index pages and articles
+        for lang_code in LANGUAGES:
+            yield f"{base_url}/{lang_code}/", 'daily', '0.9'
+            for post in all_processed_posts.get(lang_code, []):
+                yield f"{base_url}/{lang_code}/{post.url_path}", 'weekly', '0.8'
+    
+    url_count = 0
+    with etree.xmlfile(sitemap_path, encoding='utf-8') as xf:
+        xf.write_declaration()
+        with xf.element('urlset', xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'):
+            for loc, changefreq, priority in iter_urls():
+                xf.write('\n  ')
+                with xf.element('url'):
+                    for tag, value in (('loc', loc), ('lastmod', current_date),
+                                       ('changefreq', changefreq), ('priority', priority)):
+                        xf.write('\n    ')
+                        with xf.element(tag):
+                            xf.write(value)
+                    xf.write('\n  ')
+                url_count += 1
+            xf.write('\n')
+    
+    return url_count
+
+
+def plan_backlinks(num_posts: int, sitemap_urls: List[str], anchors: List[str], rng: random.Random) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Pick a (target_url, anchor_text) backlink for every post up front.
+    URLs are taken from a shuffled cycle over the sitemap, so they are spread evenly
+    (no URL repeats until every URL has been used once).
+    """
+    if not sitemap_urls:
+        return [(None, None)] * num_posts
+    
+    url_order = list(range(len(sitemap_urls)))
+    rng.shuffle(url_order)
+    return [
+        (sitemap_urls[url_order[i % len(url_order)]], anchors[rng.randrange(len(anchors))])
+        for i in range(num_posts)
     ]
-    
-    for url_data in urls:
-        xml_lines.append('  <url>')
-        xml_lines.append(f"    <loc>{url_data['loc']}</loc>")
-        xml_lines.append(f"    <lastmod>{url_data['lastmod']}</lastmod>")
-        xml_lines.append(f"    <changefreq>{url_data['changefreq']}</changefreq>")
-        xml_lines.append(f"    <priority>{url_data['priority']}</priority>")
-        xml_lines.append('  </url>')
-    
-    xml_lines.append('</urlset>')
-    
-    return '\n'.join(xml_lines)
 
 
 def assign_internal_links(current_index: int, total_posts: int, num_links: int) -> List[int]:
@@ -601,73 +1052,96 @@ def assign_internal_links(current_index: int, total_posts: int, num_links: int)
     Randomly select indices for internal linking.
     Excludes the current article index.
     """
-    available_indices = [i for i in range(total_posts) if i != current_index]
-    if len(available_indices) < num_links:
-        return available_indices
-    return random.sample(available_indices, num_links)
+    if total_posts - 1 <= num_links:
+        return [i for i in range(total_posts) if i != current_index]
+    # Sample from the other total_posts - 1 positions without building a candidate list:
+    # draw from range(total_posts - 1) and shift picks at or past current_index up by one
+    return [i + (i >= current_index) for i in random.sample(range(total_posts - 1), num_links)]
+
+
+@dataclass(slots=True)
+class Post:
+    """
+    A translated article as it moves through linking, rendering and the sitemap.
+    Skipped posts (already built by a previous run) carry no content.
+    """
+    title: str
+    filename: str
+    slug: str
+    index: int
+    content: str = ''
+    meta_description: str = ''
+    related_articles: List[Dict] = field(default_factory=list)
+    skipped: bool = False
+    
+    @property
+    def url_path(self) -> str:
+        """Clean URL without .html."""
+        return self.slug
 
 
-def process_single_article(args: Tuple) -> Optional[Dict]:
+def finalize_article(translated_title: str, translated_content: str, target_url: Optional[str], anchor_text: Optional[str], lang_code: str) -> Dict:
+    """
+    CPU-bound part of article processing: backlink injection and metadata.
+    Runs in a worker process, so it must stay a top-level (picklable) function.
+    """
+    # Steps 3-4: Inject backlink and extract the meta description from a single parse
+    if translated_content:
+        root = parse_fragment(translated_content)
+        if target_url:
+            append_backlink(root, target_url, anchor_text, lang_code)
+            translated_content = fragment_to_html(root)
+        meta_description = truncate_meta_description(fragment_text(root))
+    else:
+        meta_description = ""
+    
+    # Step 4: Generate metadata
+    slug = generate_slug(translated_title)
+    # Create filename without .html extension (clean URLs)
+    filename = f"{slug}.html"  # File still has .html but URL won't show it
+    
+    return {
+        'content': translated_content,
+        'filename': filename,
+        'slug': slug,
+        'meta_description': meta_description
+    }
+
+
+# Set on Ctrl+C so queued article tasks return immediately instead of running to completion at exit
+build_cancelled = threading.Event()
+
+def process_single_article(args: Tuple) -> Optional[Post]:
     """
     Process a single article (thread-safe function for parallel processing).
+    Translation runs in the calling thread; CPU-bound HTML work is sent to cpu_executor.
+    Already processed posts are filtered out by the caller before submission, and
+    progress is recorded by the caller from the returned data.
     Returns processed article data or None if failed.
     """
-    post_index, post, lang_code, lang_config, sitemap_urls, progress = args
+    post_index, post, lang_code, backlink, cpu_executor = args
+    if build_cancelled.is_set():
+        return None
     
     try:
-        # Check if already processed (thread-safe check)
-        with progress_lock:
-            if is_post_processed(post_index, lang_code, [post], progress):
-                post_data = progress[lang_code][str(post_index)]
-                return {
-                    'title': post_data['title'],
-                    'filename': post_data['filename'],
-                    'slug': post_data['slug'],
-                    'index': post_index,
-                    'skipped': True
-                }
-        
         # Step 1: Clean content (remove external links)
-        cleaned_content = clean_content(post['content'])
+        cleaned_content = cpu_executor.submit(clean_content, post['content']).result()
         
-        # Step 2: Translate title and content (with cache)
-        translated_title = translate_text(post['title'], 'uz', lang_code, use_cache=True)
-        translated_content = translate_text(cleaned_content, 'uz', lang_code, use_cache=True)
+        # Step 2: Translate title and content (with cache) in one batch.
+        # The title goes last so it can share a request with the final content chunk.
+        content_result = queue_translation(cleaned_content, 'uz', lang_code, use_cache=True)
+        title_result = queue_translation(post['title'], 'uz', lang_code, use_cache=True)
+        batch_translator.flush()
+        translated_title = title_result()
+        translated_content = content_result()
         
-        # Step 3: Inject backlink
-        if sitemap_urls:
-            target_url = random.choice(sitemap_urls)
-            anchor_text = random.choice(lang_config['anchors'])
-            translated_content = inject_backlink(
-                translated_content, target_url, anchor_text, lang_code
-            )
-        
-                # Step 4: Generate metadata
-                meta_description = extract_meta_description(translated_content)
-                slug = generate_slug(translated_title)
-                # Create filename without .html extension (clean URLs)
-                filename = f"{slug}.html"  # File still has .html but URL won't show it
-                url_path = slug  # Clean URL without .html
-        
-        # Thread-safe progress update
-        with progress_lock:
-            progress[lang_code][str(post_index)] = {
-                'title': translated_title,
-                'filename': filename,
-                'slug': slug,
-                'meta_description': meta_description
-            }
+        # Steps 3-4: Backlink (chosen up front in plan_backlinks) and metadata
+        target_url, anchor_text = backlink
+        article = cpu_executor.submit(
+            finalize_article, translated_title, translated_content, target_url, anchor_text, lang_code
+        ).result()
         
-        return {
-            'title': translated_title,
-            'content': translated_content,
-            'filename': filename,
-            'url_path': url_path,  # Clean URL without .html
-            'slug': slug,
-            'index': post_index,
-            'meta_description': meta_description,
-            'skipped': False
-        }
+        return Post(title=translated_title, index=post_index, **article)
         
     except Exception as e:
         # Log error but don't stop the process
@@ -675,6 +1149,71 @@ def process_single_article(args: Tuple) -> Optional[Dict]:
         return None
 
 
+def write_file_bytes(path: str, data: bytes):
+    """
+    Write bytes to a file with raw os.open/os.write (no Python file object or text layer).
+    Each article has its own path, so no lock is needed.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def render_article_files(posts: List[Post], lang_code: str, lang_name: str, related_title: str, lang_dir: str) -> int:
+    """
+    Render and write the HTML files for a batch of posts of one language.
+    Runs in a worker process, so it must stay a top-level (picklable) function.
+    Returns the number of files written.
+    """
+    # Bind the per-language context once for the whole batch
+    article_template, _, _ = get_templates()
+    render_article = functools.partial(
+        article_template.render,
+        lang_code=lang_code,
+        lang_name=lang_name,
+        related_section_title=related_title
+    )
+    
+    written = 0
+    for post in posts:
+        try:
+            # Render HTML with stored translated content
+            html_content = render_article(
+                title=post.title,
+                content=post.content,
+                meta_description=post.meta_description,
+                related_articles=post.related_articles
+            )
+            
+            write_file_bytes(os.path.join(lang_dir, post.filename), html_content.encode('utf-8'))
+            written += 1
+        except Exception as e:
+            print(f"  [ERROR] Error generating HTML for {post.title[:40]}: {e}")
+    return written
+
+
+def write_template_if_changed(name: str, body: str) -> bool:
+    """
+    Write a template file unless it already exists with exactly this content.
+    Returns True if the file was written.
+    """
+    path = os.path.join(TEMPLATES_DIR, name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == body:
+                return False
+    except OSError:
+        pass
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(body)
+    return True
+
+
 def create_default_templates():
     """Create default Jinja2 templates if they don't exist."""
     
@@ -683,8 +1222,8 @@ def create_default_templates():
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{{ meta_description }}">
-    <title>{{ title }}</title>
+    <meta name="description" content="{{ meta_description | e }}">
+    <title>{{ title | e }}</title>
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@1/css/pico.min.css">
     <style>
         nav.container-fluid {
@@ -740,16 +1279,16 @@ def create_default_templates():
         <div class="breadcrumbs">
             <a href="../index.html">Home</a> &gt; 
             <a href="index.html">{{ lang_name }}</a> &gt; 
-            <strong>{{ title }}</strong>
+            <strong>{{ title | e }}</strong>
         </div>
         
         <article>
             <header>
-                <h1>{{ title }}</h1>
+                <h1>{{ title | e }}</h1>
             </header>
             
             <div class="content">
-                {{ content | safe }}
+                {{ content }}
             </div>
             
             {% if related_articles %}
@@ -758,7 +1297,7 @@ def create_default_templates():
                 <ul>
                     {% for article in related_articles %}
                     <li>
-                        <a href="{{ article.filename }}">{{ article.title }}</a>
+                        <a href="{{ article.filename }}">{{ article.title | e }}</a>
                     </li>
                     {% endfor %}
                 </ul>
@@ -778,7 +1317,7 @@ def create_default_templates():
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{{ meta_description }}">
+    <meta name="description" content="{{ meta_description | e }}">
     <title>{{ page_title }}</title>
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@1/css/pico.min.css">
     <style>
@@ -849,7 +1388,7 @@ def create_default_templates():
             {% for post in posts %}
             <div class="article-card">
                 <a href="{{ post.filename }}">
-                    <h3>{{ post.title }}</h3>
+                    <h3>{{ post.title | e }}</h3>
                 </a>
             </div>
             {% endfor %}
@@ -994,7 +1533,7 @@ def create_default_templates():
                 <div class="news-card">
                     <span class="lang-badge">{{ article.lang_name }}</span>
                     <a href="{{ article.url }}">
-                        <h3>{{ article.title }}</h3>
+                        <h3>{{ article.title | e }}</h3>
                     </a>
                 </div>
                 {% endfor %}
@@ -1009,17 +1548,34 @@ def create_default_templates():
 </body>
 </html>"""
     
-    # Write templates
-    with open(os.path.join(TEMPLATES_DIR, 'article.html'), 'w', encoding='utf-8') as f:
-        f.write(article_template)
-    
-    with open(os.path.join(TEMPLATES_DIR, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(index_template)
+    # Write templates (identical files are left untouched, keeping their Jinja bytecode cache valid)
+    written = [
+        name for name, body in (
+            ('article.html', article_template),
+            ('index.html', index_template),
+            ('landing.html', landing_template)
+        )
+        if write_template_if_changed(name, body)
+    ]
     
-    with open(os.path.join(TEMPLATES_DIR, 'landing.html'), 'w', encoding='utf-8') as f:
-        f.write(landing_template)
+    if written:
+        print(f"[OK] Created default templates: {', '.join(written)}")
+
+
+@functools.lru_cache(maxsize=None)
+def get_templates():
+    """
+    Return the compiled (article, index, landing) templates, loaded once per process.
+    Writes the default templates first if any of them doesn't exist yet.
+    """
+    if not all(os.path.exists(os.path.join(TEMPLATES_DIR, name)) for name in ('article.html', 'index.html', 'landing.html')):
+        create_default_templates()
     
-        print("[OK] Created default templates")
+    return (
+        jinja_env.get_template('article.html'),
+        jinja_env.get_template('index.html'),
+        jinja_env.get_template('landing.html')
+    )
 
 
 def main():
@@ -1046,21 +1602,10 @@ def main():
         print("[ERROR] No posts found. Exiting.")
         sys.exit(1)
     
-    # Setup Jinja2 environment
-    env = Environment(
-        loader=FileSystemLoader(TEMPLATES_DIR),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
-    
-    # Check if templates exist, create them if not
-    if not os.path.exists(os.path.join(TEMPLATES_DIR, 'article.html')):
-        create_default_templates()
-    
-    # Load templates
+    # Load templates (article.html is rendered in worker processes; loading it here fails early
+    # and fills the on-disk bytecode cache before any worker process starts)
     try:
-        article_template = env.get_template('article.html')
-        index_template = env.get_template('index.html')
-        landing_template = env.get_template('landing.html')
+        _, index_template, landing_template = get_templates()
     except Exception as e:
         print(f"[ERROR] Error loading templates: {e}")
         sys.exit(1)
@@ -1069,83 +1614,97 @@ def main():
     all_processed_posts = {}
     latest_articles = []  # For landing page news feed
     
+    # Random source for backlink planning (seedable for reproducible builds)
+    rng = random.Random(BACKLINK_SEED)
+    
+    # Worker processes for CPU-bound HTML work ('spawn' avoids forking while translation threads run)
+    cpu_executor = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    
+    # Queue translation work for every language up front on one shared thread pool, so later
+    # languages keep translating while earlier ones are linked and rendered below.
+    # Results are still collected (and progress recorded) in the main thread, one language at a time.
+    translation_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    language_jobs = {}
     for lang_code, lang_config in LANGUAGES.items():
-        print(f"\n{'='*60}")
-        print(f"Processing {lang_config['name']} ({lang_code})...")
-        print(f"{'='*60}")
-        
         if lang_code not in progress:
             progress[lang_code] = {}
         
-        processed_posts = []
-        lang_dir = os.path.join(OUTPUT_DIR, lang_code)
-        skipped_count = 0
-        processed_count = 0
-        error_count = 0
-        start_time = time.time()
-        
-        # Prepare tasks for parallel processing
-        tasks = []
+        skipped_posts = []
+        future_to_index = {}
+        backlinks = plan_backlinks(len(posts), sitemap_urls, lang_config['anchors'], rng)
         for idx, post in enumerate(posts):
             # Quick check if already processed (before adding to tasks)
             if is_post_processed(idx, lang_code, posts, progress):
                 post_data = progress[lang_code][str(idx)]
-                processed_posts.append({
-                    'title': post_data['title'],
-                    'filename': post_data['filename'],
-                    'slug': post_data['slug'],
-                    'index': idx,
-                    'skipped': True
-                })
-                skipped_count += 1
+                skipped_posts.append(Post(
+                    title=post_data['title'],
+                    filename=post_data['filename'],
+                    slug=post_data['slug'],
+                    index=idx,
+                    skipped=True
+                ))
             else:
-                tasks.append((idx, post, lang_code, lang_config, sitemap_urls, progress))
+                task = (idx, post, lang_code, backlinks[idx], cpu_executor)
+                future_to_index[translation_executor.submit(process_single_article, task)] = idx
+        language_jobs[lang_code] = (skipped_posts, future_to_index)
+    
+    for lang_code, lang_config in LANGUAGES.items():
+        print(f"\n{'='*60}")
+        print(f"Processing {lang_config['name']} ({lang_code})...")
+        print(f"{'='*60}")
+        
+        processed_posts, future_to_index = language_jobs.pop(lang_code)
+        lang_dir = os.path.join(OUTPUT_DIR, lang_code)
+        skipped_count = len(processed_posts)
+        processed_count = 0
+        error_count = 0
+        start_time = time.time()
         
         if skipped_count > 0:
             print(f"[INFO] Skipping {skipped_count} already processed articles...")
         
-        # Process articles in parallel using ThreadPoolExecutor
-        print(f"[INFO] Processing {len(tasks)} articles with {MAX_WORKERS} parallel workers...")
+        print(f"[INFO] Processing {len(future_to_index)} articles with {MAX_WORKERS} parallel workers...")
         
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit all tasks
-            future_to_index = {
-                executor.submit(process_single_article, task): task[0] 
-                for task in tasks
-            }
-            
-            # Process completed tasks with progress bar
-            with tqdm(total=len(tasks), desc=f"Translating {lang_config['name']}", unit="article") as pbar:
-                for future in as_completed(future_to_index):
-                    result = future.result()
-                    if result:
-                        if result.get('skipped'):
-                            skipped_count += 1
-                        else:
-                            processed_posts.append(result)
-                            processed_count += 1
-                            
-                            # Thread-safe update to latest articles
-                            with latest_articles_lock:
-                                latest_articles.append({
-                                    'title': result['title'],
-                                    'url': f"{lang_code}/{result['filename']}",
-                                    'lang_name': lang_config['name']
-                                })
-                    else:
-                        error_count += 1
-                    
-                    pbar.update(1)
+        # Process completed tasks with progress bar
+        with tqdm(total=len(future_to_index), desc=f"Translating {lang_config['name']}", unit="article",
+                  mininterval=PROGRESS_BAR_INTERVAL) as pbar:
+            for future in as_completed(future_to_index):
+                result = future.result()
+                if result:
+                    processed_posts.append(result)
+                    processed_count += 1
                     
-                    # Save progress periodically
-                    if (processed_count + skipped_count) % PROGRESS_SAVE_INTERVAL == 0:
-                        save_progress(progress)
+                    # Merge the worker's result into progress (main thread only, no lock)
+                    record_progress(progress, lang_code, result.index, {
+                        'title': result.title,
+                        'filename': result.filename,
+                        'slug': result.slug,
+                        'meta_description': result.meta_description
+                    })
+                else:
+                    error_count += 1
+                
+                pbar.update(1)
+                
+                # Save progress periodically
+                if (processed_count + skipped_count) % PROGRESS_SAVE_INTERVAL == 0:
+                    flush_progress_log()
         
         # Sort processed_posts by index to maintain order
-        processed_posts.sort(key=lambda x: x['index'])
+        processed_posts.sort(key=attrgetter('index'))
+        
+        # News feed candidates (includes articles skipped on resume, so the feed isn't emptied)
+        latest_articles.extend(
+            {
+                'title': post.title,
+                'url': f"{lang_code}/{post.filename}",
+                'lang_name': lang_config['name']
+            }
+            for post in processed_posts
+        )
         
-        # Final progress save
-        save_progress(progress)
+        # Final progress flush (compaction happens once at the end of the run)
+        flush_progress_log()
         
         elapsed_total = time.time() - start_time
         print(f"\n[OK] Completed {lang_config['name']}: {processed_count} processed, {skipped_count} skipped, {error_count} errors in {int(elapsed_total/60)} min")
@@ -1156,82 +1715,62 @@ def main():
         print(f"{'─'*60}")
         
         print(f"Assigning internal links to {len(processed_posts)} articles...")
-        with tqdm(total=len(processed_posts), desc="Linking articles", unit="article") as pbar:
-            for post in processed_posts:
-                current_idx = post['index']
-                num_links = random.randint(MIN_INTERNAL_LINKS, min(MAX_INTERNAL_LINKS, len(processed_posts) - 1))
-                related_indices = assign_internal_links(current_idx, len(processed_posts), num_links)
+        with tqdm(total=len(processed_posts), desc="Linking articles", unit="article",
+                  mininterval=PROGRESS_BAR_INTERVAL) as pbar:
+            max_links = min(MAX_INTERNAL_LINKS, len(processed_posts) - 1)
+            for position, post in enumerate(processed_posts):
+                # Links are positions in processed_posts (not CSV indices, which have gaps after failures)
+                num_links = random.randint(min(MIN_INTERNAL_LINKS, max_links), max_links)
+                related_indices = assign_internal_links(position, len(processed_posts), num_links)
                 
-                post['related_articles'] = [
+                post.related_articles = [
                     {
-                        'title': processed_posts[i]['title'],
-                        'filename': processed_posts[i].get('url_path', processed_posts[i]['filename'].replace('.html', ''))
+                        'title': processed_posts[i].title,
+                        'filename': processed_posts[i].url_path
                     }
                     for i in related_indices
                 ]
-                pbar.update(1)
+                # This loop is cheap per article, so update the bar in batches
+                if (position + 1) % PROGRESS_BAR_BATCH == 0:
+                    pbar.update(PROGRESS_BAR_BATCH)
+            pbar.update(len(processed_posts) % PROGRESS_BAR_BATCH)
         
         # Step 6: Generate HTML files for this language
         print(f"\n{'─'*60}")
         print(f"Generating HTML files for {lang_config['name']}...")
         print(f"{'─'*60}")
         
-        # Determine related section title based on language
-        if lang_code == 'ru':
-            related_title = "Читайте также"
-        else:
-            related_title = "Read Also"
+        lang_meta = LANG_META[lang_code]
+        related_title = lang_meta['related_title']
         
-        def generate_html_file(post):
-            """Generate HTML file for a single post (thread-safe)."""
-            try:
-                # Render HTML with stored translated content
-                html_content = article_template.render(
-                    title=post['title'],
-                    content=post.get('content', ''),
-                    meta_description=post.get('meta_description', ''),
-                    lang_code=lang_code,
-                    lang_name=lang_config['name'],
-                    related_articles=post.get('related_articles', []),
-                    related_section_title=related_title
-                )
-                
-                article_path = os.path.join(lang_dir, post['filename'])
-                with file_write_lock:
-                    with open(article_path, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-                return True
-            except Exception as e:
-                print(f"  [ERROR] Error generating HTML for {post['title'][:40]}: {e}")
-                return False
+        # Skipped posts were rendered by a previous run; their content isn't kept in progress,
+        # so re-rendering them here would overwrite the article with an empty body
+        posts_to_render = [post for post in processed_posts if not post.skipped]
         
-        print(f"Generating HTML files for {len(processed_posts)} articles...")
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            with tqdm(total=len(processed_posts), desc="Generating HTML", unit="file") as pbar:
-                futures = {executor.submit(generate_html_file, post): post for post in processed_posts}
-                for future in as_completed(futures):
-                    future.result()  # Wait for completion
-                    pbar.update(1)
+        print(f"Generating HTML files for {len(posts_to_render)} articles...")
+        with tqdm(total=len(posts_to_render), desc="Generating HTML", unit="file",
+                  mininterval=PROGRESS_BAR_INTERVAL) as pbar:
+            # One task per batch, so the language context is sent and bound once per batch
+            futures = {}
+            for start in range(0, len(posts_to_render), RENDER_BATCH_SIZE):
+                batch = posts_to_render[start:start + RENDER_BATCH_SIZE]
+                futures[cpu_executor.submit(
+                    render_article_files, batch, lang_code, lang_config['name'], related_title, lang_dir
+                )] = len(batch)
+            for future in as_completed(futures):
+                future.result()  # Wait for completion
+                pbar.update(futures[future])
         
         # Step 7: Generate index.html for this language
         print(f"\nGenerating index.html for {lang_config['name']}...")
         
-        if lang_code == 'ru':
-            page_title = "Образовательные статьи"
-            page_description = "Статьи и новости об образовании в Узбекистане"
-            meta_desc = "Образовательные статьи и новости из Узбекистана"
-        else:
-            page_title = "Educational Articles"
-            page_description = "Articles and news about education in Uzbekistan"
-            meta_desc = "Educational articles and news from Uzbekistan"
-        
         index_html = index_template.render(
-            posts=[{'title': p['title'], 'filename': p.get('url_path', p['filename'].replace('.html', ''))} for p in processed_posts],
+            posts=[{'title': p.title, 'filename': p.url_path} for p in processed_posts],
             lang_code=lang_code,
             lang_name=lang_config['name'],
-            page_title=page_title,
-            page_description=page_description,
-            meta_description=meta_desc
+            page_title=lang_meta['page_title'],
+            page_description=lang_meta['page_description'],
+            meta_description=lang_meta['meta_description']
         )
         
         index_path = os.path.join(lang_dir, 'index.html')
@@ -1242,13 +1781,20 @@ def main():
         
         all_processed_posts[lang_code] = processed_posts
     
+    translation_executor.shutdown()
+    cpu_executor.shutdown()
+    flush_cache_writes()
+    
+    # Compact the progress log into a single snapshot
+    save_progress(progress)
+    
     # Step 8: Generate landing page with news feed
     print(f"\n{'='*60}")
     print("Generating landing page with news feed...")
     print(f"{'='*60}")
     
-    # Sort latest articles and take most recent
-    latest_articles_sorted = sorted(latest_articles, key=lambda x: x['title'], reverse=True)[:LATEST_ARTICLES_COUNT]
+    # Take the top articles without sorting the whole list
+    latest_articles_sorted = heapq.nlargest(LATEST_ARTICLES_COUNT, latest_articles, key=itemgetter('title'))
     
     landing_html = landing_template.render(latest_articles=latest_articles_sorted)
     landing_path = os.path.join(OUTPUT_DIR, 'index.html')
@@ -1265,12 +1811,10 @@ def main():
     # Base URL for sitemap
     base_url = "https://iplex.uz"
     
-    sitemap_xml = generate_sitemap(all_processed_posts, base_url)
     sitemap_path = os.path.join(OUTPUT_DIR, 'sitemap.xml')
-    with open(sitemap_path, 'w', encoding='utf-8') as f:
-        f.write(sitemap_xml)
+    url_count = generate_sitemap(all_processed_posts, sitemap_path, base_url)
     
-    print(f"[OK] Saved: sitemap.xml ({len(sitemap_xml.split('<url>')) - 1} URLs)")
+    print(f"[OK] Saved: sitemap.xml ({url_count} URLs)")
     print(f"[INFO] Don't forget to update the base_url in the code to your actual domain!")
     
     print("\n" + "=" * 60)
@@ -1278,7 +1822,7 @@ def main():
     print(f"Generated {len(posts)} articles in {len(LANGUAGES)} languages")
     print(f"Output directory: {OUTPUT_DIR}/")
     print(f"Progress saved to: {PROGRESS_FILE}")
-    print(f"Cache directory: {CACHE_DIR}/")
+    print(f"Cache database: {CACHE_DB}")
     print(f"Sitemap: {OUTPUT_DIR}/sitemap.xml")
     print("=" * 60)
 
@@ -1287,6 +1831,9 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
+        build_cancelled.set()
+        flush_progress_log()
+        flush_cache_writes()
         print("\n\n[WARNING] Script interrupted. Progress has been saved.")
         print("You can resume by running the script again - it will skip already processed articles.")
         sys.exit(0)
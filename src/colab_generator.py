@@ -4,23 +4,27 @@
 # ============================================================================
 
 # Step 1: Install required packages
-!pip install deep-translator jinja2 beautifulsoup4 tqdm requests -q
+!pip install deep-translator markupsafe beautifulsoup4 tqdm requests -q
 
 # Step 2: Import libraries
 import os
 import json
 import random
 import re
+import html
 import zipfile
 import shutil
+import threading
+import hashlib
+import sqlite3
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.colab import files
 from bs4 import BeautifulSoup
-from jinja2 import Environment, BaseLoader
 from deep_translator import GoogleTranslator
 from tqdm import tqdm
 import requests
+from markupsafe import escape
 import csv
 import sys
 
@@ -37,7 +41,11 @@ while True:
 # Configuration
 # ============================================================================
 OUTPUT_DIR = "output"
-MAX_WORKERS = 10
+TRANSLATION_CACHE_DB = "translations.db"  # Survives cell reruns, so unchanged posts are not re-translated
+MAX_WORKERS = 10  # Concurrent translation requests, shared by all languages
+ZIP_COMPRESS_LEVEL = 1  # Fastest deflate level; HTML still compresses well and the ZIP is a one-shot download
+TRANSLATION_BATCH_ITEMS = 100  # Max texts packed into one translation request
+TRANSLATION_BATCH_CHARS = 4000  # Max characters per translation request
 SITEMAP_URL = "https://infoedu.uz/sitemap.xml"
 BACKLINK_DOMAIN = "https://infoedu.uz"
 
@@ -54,6 +62,40 @@ LANGUAGES = {
     }
 }
 
+# Per-language page text (section title on article pages, heading and meta on the language index)
+LANG_META = {
+    'en': {
+        'related_title': "Read Also",
+        'page_title': "Educational Articles",
+        'page_description': "Articles and news about education in Uzbekistan",
+        'meta_description': "Educational articles and news from Uzbekistan"
+    },
+    'ru': {
+        'related_title': "Читайте также",
+        'page_title': "Образовательные статьи",
+        'page_description': "Статьи и новости об образовании в Узбекистане",
+        'meta_description': "Образовательные статьи и новости из Узбекистана"
+    }
+}
+
+# Precompiled HTML patterns (anchor unwrapping and tag stripping without building a soup)
+ANCHOR_TAG_RE = re.compile(r'</?a\b[^>]*>', re.IGNORECASE)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+PARAGRAPH_END_RE = re.compile(r'(?<=</p>)', re.IGNORECASE)
+
+# Slug patterns, plus an ASCII translate table derived from them (same output, one C-level pass)
+SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+SLUG_DASH_RE = re.compile(r'[-\s]+')
+SLUG_DASH_RUN_RE = re.compile(r'-{2,}')
+# Jinja variable substitutions ({{ var }} / {{ var | safe }}), used to compile the templates into format strings
+JINJA_VAR_RE = re.compile(r'\{\{\s*([\w.]+)(?:\s*\|\s*safe)?\s*\}\}')
+
+SLUG_ASCII_TABLE = {
+    i: ('-' if SLUG_DASH_RE.match(chr(i)) else None)
+    for i in range(128)
+    if SLUG_STRIP_RE.match(chr(i)) or SLUG_DASH_RE.match(chr(i))
+}
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -68,10 +110,24 @@ def clean_content(content: str) -> str:
     """Remove all <a> tags from content but keep the text inside them."""
     if not content:
         return ""
-    soup = BeautifulSoup(content, 'html.parser')
-    for anchor in soup.find_all('a'):
-        anchor.unwrap()
-    return str(soup)
+    return ANCHOR_TAG_RE.sub('', content)
+
+def split_paragraphs(content: str) -> list:
+    """Split HTML content after each closing </p>, dropping whitespace-only pieces."""
+    return [part for part in PARAGRAPH_END_RE.split(content) if part.strip()]
+
+# GoogleTranslator mutates its URL params on every call, so instances are reused per thread only
+_translator_local = threading.local()
+
+def get_translator(source_lang: str, target_lang: str) -> GoogleTranslator:
+    """Return this thread's translator for a language pair (created on first use)."""
+    translators = getattr(_translator_local, 'translators', None)
+    if translators is None:
+        translators = _translator_local.translators = {}
+    translator = translators.get((source_lang, target_lang))
+    if translator is None:
+        translator = translators[(source_lang, target_lang)] = GoogleTranslator(source=source_lang, target=target_lang)
+    return translator
 
 def translate_text(text: str, source_lang: str = 'uz', target_lang: str = 'en') -> str:
     """Translate text using deep-translator."""
@@ -95,58 +151,171 @@ def translate_text(text: str, source_lang: str = 'uz', target_lang: str = 'en')
         if current_chunk:
             chunks.append(current_chunk.strip())
         
+        translator = get_translator(source_lang, target_lang)
         translated_chunks = []
         for chunk in chunks:
             try:
-                translator = GoogleTranslator(source=source_lang, target=target_lang)
-                translated = translator.translate(chunk)
-                translated_chunks.append(translated)
+                translated_chunks.append(translator.translate(chunk))
             except:
                 translated_chunks.append(chunk)
         return " ".join(translated_chunks)
     
     try:
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
-        translated = translator.translate(text_clean)
+        translated = get_translator(source_lang, target_lang).translate(text_clean)
         return translated if translated else text_clean
     except Exception as e:
         print(f"Translation error: {e}")
         return text_clean
 
+def translate_batch(texts: list, source_lang: str = 'uz', target_lang: str = 'en') -> list:
+    """Translate several single-line texts in one request, joined by newlines."""
+    if len(texts) == 1:
+        return [translate_text(texts[0], source_lang, target_lang)]
+    try:
+        translated = get_translator(source_lang, target_lang).translate("\n".join(texts))
+        parts = translated.split("\n") if translated else []
+        if len(parts) == len(texts):
+            return [part.strip() or text for part, text in zip(parts, texts)]
+    except Exception as e:
+        print(f"Batch translation error: {e}")
+    # Response didn't split back cleanly; fall back to one request per text
+    return [translate_text(text, source_lang, target_lang) for text in texts]
+
+# One SQLite connection per thread (languages are translated on separate threads)
+_cache_local = threading.local()
+
+def get_cache_db() -> sqlite3.Connection:
+    """Return this thread's translation cache connection (opened on first use)."""
+    conn = getattr(_cache_local, 'conn', None)
+    if conn is None:
+        conn = _cache_local.conn = sqlite3.connect(TRANSLATION_CACHE_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+def translation_key(text: str, source_lang: str, target_lang: str) -> str:
+    """Cache key for a text and language pair."""
+    return f"{source_lang}:{target_lang}:" + hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def load_cached_translations(keys: list) -> dict:
+    """Return {key: translation} for the keys present in the cache."""
+    found = {}
+    db = get_cache_db()
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        found.update(db.execute(f"SELECT key, value FROM translations WHERE key IN ({placeholders})", chunk))
+    return found
+
+def translate_all(texts: list, executor: ThreadPoolExecutor, source_lang: str = 'uz', target_lang: str = 'en', desc: str = "Translating") -> list:
+    """
+    Translate a list of texts, packing them into as few requests as the batch limits allow.
+    Duplicates are translated once, and cached translations skip the network entirely.
+    Requests run on executor, which concurrent callers share so MAX_WORKERS caps them all together.
+    """
+    # Collapse whitespace up front so every text is a single line and can share a request
+    results = [' '.join(text.split()) if text else text for text in texts]
+    
+    # Group indices by unique text, then drop the ones already in the cache
+    positions = {}
+    for i, text in enumerate(results):
+        if text:
+            positions.setdefault(text, []).append(i)
+    keys = {text: translation_key(text, source_lang, target_lang) for text in positions}
+    cached = load_cached_translations(list(keys.values()))
+    pending = []
+    for text, indices in positions.items():
+        translated = cached.get(keys[text])
+        if translated is None:
+            pending.append(text)
+        else:
+            for i in indices:
+                results[i] = translated
+    tqdm.write(f"[INFO] {target_lang}: {len(positions) - len(pending)} of {len(positions)} unique texts found in translation cache")
+    
+    batches = []
+    batch = []
+    size = 0
+    for text in pending:
+        if len(text) > TRANSLATION_BATCH_CHARS:
+            batches.append([text])
+            continue
+        if batch and (len(batch) >= TRANSLATION_BATCH_ITEMS or size + len(text) + 1 > TRANSLATION_BATCH_CHARS):
+            batches.append(batch)
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        batches.append(batch)
+    
+    def run_batch(batch_texts):
+        return batch_texts, translate_batch(batch_texts, source_lang, target_lang)
+    
+    # Batches are independent requests, so keep a few in flight at once
+    new_rows = []
+    futures = [executor.submit(run_batch, batch_texts) for batch_texts in batches]
+    for future in tqdm(as_completed(futures), total=len(futures), desc=desc, unit="batch"):
+        batch_texts, translated = future.result()
+        for text, translated_text in zip(batch_texts, translated):
+            for i in positions[text]:
+                results[i] = translated_text
+            # Failed translations come back unchanged; don't cache those
+            if translated_text and translated_text != text:
+                new_rows.append((keys[text], translated_text))
+    
+    if new_rows:
+        db = get_cache_db()
+        db.executemany("INSERT OR IGNORE INTO translations (key, value) VALUES (?, ?)", new_rows)
+        db.commit()
+    return results
+
+def translate_posts(titles: list, paragraphs: list, target_lang: str, desc: str, executor: ThreadPoolExecutor) -> tuple:
+    """
+    Translate all titles and body paragraphs for one language, many per request.
+    Returns (translated_titles, translated_contents) with paragraphs re-joined per article.
+    """
+    translated = translate_all(
+        titles + [paragraph for article_paragraphs in paragraphs for paragraph in article_paragraphs],
+        executor, 'uz', target_lang, desc=desc
+    )
+    translated_titles = translated[:len(titles)]
+    translated_contents = []
+    offset = len(titles)
+    for article_paragraphs in paragraphs:
+        translated_contents.append(' '.join(translated[offset:offset + len(article_paragraphs)]))
+        offset += len(article_paragraphs)
+    return translated_titles, translated_contents
+
 def inject_backlink(content: str, target_url: str, anchor_text: str) -> str:
     """Inject a dofollow backlink into the content."""
     if not content or not target_url:
         return content
     
-    soup = BeautifulSoup(content, 'html.parser')
-    backlink = soup.new_tag('a', href=target_url, rel='dofollow')
-    backlink.string = anchor_text
-    
-    paragraphs = soup.find_all('p')
-    if paragraphs:
-        last_p = paragraphs[-1]
-        last_p.append(" — ")
-        last_p.append(backlink)
-    else:
-        new_p = soup.new_tag('p')
-        new_p.append("Source: ")
-        new_p.append(backlink)
-        soup.append(new_p)
+    # Splice into the raw string instead of parsing and re-serializing the article
+    backlink = f'<a href="{html.escape(target_url)}" rel="dofollow">{html.escape(anchor_text)}</a>'
     
-    return str(soup)
+    pos = content.rfind('</p>')
+    if pos != -1:
+        return f"{content[:pos]} — {backlink}{content[pos:]}"
+    return f"{content}<p>Source: {backlink}</p>"
 
 def generate_slug(title: str) -> str:
     """Generate a URL-friendly slug from title."""
-    slug = re.sub(r'[^\w\s-]', '', title.lower())
-    slug = re.sub(r'[-\s]+', '-', slug)
+    if title.isascii():
+        slug = title.lower().translate(SLUG_ASCII_TABLE)
+        if '--' in slug:
+            slug = SLUG_DASH_RUN_RE.sub('-', slug)
+        return slug[:100]
+    slug = SLUG_STRIP_RE.sub('', title.lower())
+    slug = SLUG_DASH_RE.sub('-', slug)
     return slug[:100]
 
 def extract_meta_description(content: str, max_length: int = 160) -> str:
     """Extract or generate a meta description from content."""
     if not content:
         return ""
-    soup = BeautifulSoup(content, 'html.parser')
-    text = soup.get_text(strip=True)
+    text = ' '.join(html.unescape(HTML_TAG_RE.sub(' ', content)).split())
     if len(text) > max_length:
         truncated = text[:max_length]
         last_period = truncated.rfind('.')
@@ -155,35 +324,49 @@ def extract_meta_description(content: str, max_length: int = 160) -> str:
         return truncated + "..."
     return text
 
+def write_file_bytes(path: str, data: bytes):
+    """Write bytes to a file with raw os.open/os.write (no text layer or codec)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 def read_posts_csv(csv_file: str) -> list:
     """Read posts from CSV file."""
     posts = []
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        # Positional reader: resolve the columns once, then index each row tuple
+        reader = csv.reader(f)
+        header = next(reader, None)
         
-        if not rows:
+        if not header:
             print("[ERROR] CSV file is empty")
             return []
         
         # Find title and content columns
-        title_col = None
-        content_col = None
-        for col in rows[0].keys():
+        title_idx = None
+        content_idx = None
+        for i, col in enumerate(header):
             col_lower = col.lower()
-            if 'title' in col_lower and not title_col:
-                title_col = col
-            if 'content' in col_lower and not content_col:
-                content_col = col
+            if 'title' in col_lower and title_idx is None:
+                title_idx = i
+            if 'content' in col_lower and content_idx is None:
+                content_idx = i
         
-        if not title_col or not content_col:
+        if title_idx is None or content_idx is None:
             print(f"[ERROR] Could not find 'title' and 'content' columns")
-            print(f"Available columns: {list(rows[0].keys())}")
+            print(f"Available columns: {header}")
             return []
         
-        for row in rows:
-            title = str(row.get(title_col, '')).strip()
-            content = str(row.get(content_col, '')).strip()
+        min_len = max(title_idx, content_idx) + 1
+        for row in reader:
+            if len(row) < min_len:
+                continue
+            title = row[title_idx].strip()
+            content = row[content_idx].strip()
             if title and content:
                 posts.append({'title': title, 'content': content})
     
@@ -361,25 +544,95 @@ LANDING_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>"""
 
+def compile_fragment(fragment: str) -> tuple:
+    """
+    Split a template fragment containing only {{ var }} substitutions into its static text,
+    pre-encoded as UTF-8 bytes, and the variable names between them.
+    """
+    parts = JINJA_VAR_RE.split(fragment)
+    return tuple(part.encode('utf-8') for part in parts[0::2]), tuple(part.replace('.', '_') for part in parts[1::2])
+
+def fill_fragment(fragment: tuple, fields: dict) -> bytes:
+    """Render a compiled fragment: only the field values are encoded, the static bytes are reused."""
+    statics, names = fragment
+    out = [statics[0]]
+    for name, static in zip(names, statics[1:]):
+        out.append(str(fields[name]).encode('utf-8'))
+        out.append(static)
+    return b''.join(out)
+
+# Pages skip Jinja: each template is split at its if/for tags into compiled fragments, whose
+# static shells (doctype, inline CSS, navigation) are encoded to bytes once at import time.
+# The article page's related-articles loop is a plain join
+_article_head, _rest = ARTICLE_TEMPLATE.split('{% if related_articles %}')
+_related_block, _article_tail = _rest.split('{% endif %}')
+_related_head, _rest = _related_block.split('{% for article in related_articles %}')
+_related_item, _related_tail = _rest.split('{% endfor %}')
+ARTICLE_HEAD = compile_fragment(_article_head)
+ARTICLE_TAIL = compile_fragment(_article_tail)
+RELATED_HEAD = compile_fragment(_related_head)
+RELATED_ITEM = compile_fragment(_related_item)
+RELATED_TAIL = compile_fragment(_related_tail)
+
+def render_related_link(post: dict) -> bytes:
+    """Render the related-articles list item linking to a post."""
+    return fill_fragment(RELATED_ITEM, {'article_filename': escape(post['filename']), 'article_title': escape(post['title'])})
+
+def render_article(post: dict, lang_code: str, lang_name: str, related_title: str) -> bytes:
+    """Render an article page as UTF-8 bytes; same output as the Jinja template, with text fields escaped."""
+    fields = {
+        'title': escape(post['title']),
+        'content': post['content'],
+        'meta_description': escape(post['meta_description']),
+        'lang_code': lang_code,
+        'lang_name': escape(lang_name)
+    }
+    related_html = post.get('related_html')
+    if related_html:
+        related_html = (
+            fill_fragment(RELATED_HEAD, {'related_section_title': escape(related_title)})
+            + related_html
+            + fill_fragment(RELATED_TAIL, fields)
+        )
+    else:
+        related_html = b''
+    return fill_fragment(ARTICLE_HEAD, fields) + related_html + fill_fragment(ARTICLE_TAIL, fields)
+
+# The index page has one posts loop; it is built straight into a byte buffer
+_index_head, _rest = INDEX_TEMPLATE.split('{% for post in posts %}')
+_index_item, _index_tail = _rest.split('{% endfor %}')
+INDEX_HEAD = compile_fragment(_index_head)
+INDEX_ITEM = compile_fragment(_index_item)
+INDEX_TAIL = compile_fragment(_index_tail)
+
+# The landing page has no variables at all
+LANDING_BYTES = LANDING_TEMPLATE.encode('utf-8')
+
+def render_index(posts: list, lang_code: str, lang_name: str, lang_meta: dict) -> bytearray:
+    """Render a language index page as UTF-8 bytes; same output as the Jinja template, with text fields escaped."""
+    fields = {
+        'lang_code': lang_code,
+        'lang_name': escape(lang_name),
+        'page_title': escape(lang_meta['page_title']),
+        'page_description': escape(lang_meta['page_description']),
+        'meta_description': escape(lang_meta['meta_description'])
+    }
+    buf = bytearray(fill_fragment(INDEX_HEAD, fields))
+    for post in posts:
+        buf += fill_fragment(INDEX_ITEM, {'post_filename': escape(post['filename']), 'post_title': escape(post['title'])})
+    buf += fill_fragment(INDEX_TAIL, fields)
+    return buf
+
 # ============================================================================
 # Main Processing Function
 # ============================================================================
 
 def process_article(args):
-    """Process a single article (for parallel execution)."""
-    post_index, post, lang_code, lang_config, sitemap_urls = args
+    """Finish a single translated article (backlink, meta description, slug)."""
+    post_index, translated_title, translated_content, target_url, anchor_text = args
     try:
-        # Clean content
-        cleaned_content = clean_content(post['content'])
-        
-        # Translate
-        translated_title = translate_text(post['title'], 'uz', lang_code)
-        translated_content = translate_text(cleaned_content, 'uz', lang_code)
-        
-        # Inject backlink
-        if sitemap_urls:
-            target_url = random.choice(sitemap_urls)
-            anchor_text = random.choice(lang_config['anchors'])
+        # Inject backlink (URL and anchor pre-sampled per language)
+        if target_url:
             translated_content = inject_backlink(translated_content, target_url, anchor_text)
         
         # Generate metadata
@@ -387,18 +640,24 @@ def process_article(args):
         slug = generate_slug(translated_title)
         filename = f"{slug}.html"
         
+        # Text fields are escaped once here; escape() in the renderers passes Markup through untouched.
+        # filename stays a plain str because it is also a filesystem path (the renderers escape it)
         return {
-            'title': translated_title,
+            'title': escape(translated_title),
             'content': translated_content,
             'filename': filename,
             'slug': slug,
             'index': post_index,
-            'meta_description': meta_description
+            'meta_description': escape(meta_description)
         }
     except Exception as e:
         print(f"Error processing article {post_index}: {e}")
         return None
 
+def render_and_write(post: dict, lang_code: str, lang_name: str, related_title: str, lang_dir: str):
+    """Render a single article page and write it to disk."""
+    write_file_bytes(os.path.join(lang_dir, post['filename']), render_article(post, lang_code, lang_name, related_title))
+
 # ============================================================================
 # Main Execution
 # ============================================================================
@@ -440,11 +699,21 @@ print("\n[STEP 4] Fetching sitemap URLs...")
 sitemap_urls = fetch_sitemap_urls(SITEMAP_URL)
 print(f"[OK] Found {len(sitemap_urls)} URLs for backlinks")
 
-# Step 5: Setup Jinja2 environment
-env = Environment(loader=BaseLoader())
-article_template = env.from_string(ARTICLE_TEMPLATE)
-index_template = env.from_string(INDEX_TEMPLATE)
-landing_template = env.from_string(LANDING_TEMPLATE)
+# Step 5: Translate every language at once. Translation is network-bound, so one thread per
+# language overlaps the requests; all languages share one request pool of MAX_WORKERS threads.
+# Paragraphs are the unit so boilerplate repeated across articles is translated (and cached) only once
+print("\n[STEP 5] Translating articles...")
+titles = [post['title'] for post in posts]
+paragraphs = [split_paragraphs(clean_content(post['content'])) for post in posts]
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as request_executor, \
+        ThreadPoolExecutor(max_workers=len(LANGUAGES)) as executor:
+    translation_futures = {
+        lang_code: executor.submit(
+            translate_posts, titles, paragraphs, lang_code, f"Translating {lang_config['name']}", request_executor
+        )
+        for lang_code, lang_config in LANGUAGES.items()
+    }
+    translations = {lang_code: future.result() for lang_code, future in translation_futures.items()}
 
 # Step 6: Process each language
 all_processed_posts = {}
@@ -454,95 +723,63 @@ for lang_code, lang_config in LANGUAGES.items():
     print(f"Processing {lang_config['name']} ({lang_code})...")
     print(f"{'='*60}")
     
-    # Process articles in parallel
-    tasks = [(idx, post, lang_code, lang_config, sitemap_urls) for idx, post in enumerate(posts)]
+    # Draw every article's backlink URL and anchor up front in two calls
+    if sitemap_urls:
+        target_urls = random.choices(sitemap_urls, k=len(posts))
+        anchor_texts = random.choices(lang_config['anchors'], k=len(posts))
+    else:
+        target_urls = anchor_texts = [None] * len(posts)
     
-    processed_posts = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        with tqdm(total=len(tasks), desc=f"Translating {lang_config['name']}", unit="article") as pbar:
-            futures = {executor.submit(process_article, task): task[0] for task in tasks}
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    processed_posts.append(result)
-                pbar.update(1)
+    translated_titles, translated_contents = translations.pop(lang_code)
     
-    # Sort by index
-    processed_posts.sort(key=lambda x: x['index'])
+    # Backlink splice, meta and slug are cheap per article, so they run inline: a pool would
+    # spend more handing article bodies to workers than it saves
+    processed_posts = []
+    for idx in tqdm(range(len(posts)), desc=f"Processing {lang_config['name']}", unit="article"):
+        result = process_article((idx, translated_titles[idx], translated_contents[idx], target_urls[idx], anchor_texts[idx]))
+        if result:
+            processed_posts.append(result)
     
     # Assign internal links (5 random articles)
     print(f"\n[INFO] Assigning internal links...")
-    for post in processed_posts:
-        current_idx = post['index']
-        available_indices = [i for i in range(len(processed_posts)) if i != current_idx]
-        num_links = min(5, len(available_indices))
-        related_indices = random.sample(available_indices, num_links) if available_indices else []
-        post['related_articles'] = [
-            {
-                'title': processed_posts[i]['title'],
-                'filename': processed_posts[i]['filename']
-            }
-            for i in related_indices
-        ]
+    # Sample positions from range(total - 1) and shift picks at or past the post's own position up
+    # by one, so no per-post candidate list is built (positions, not CSV indices, since failed
+    # articles leave gaps)
+    total = len(processed_posts)
+    num_links = min(5, total - 1)
+    # Each post's <li> link is rendered once and reused by every page that links to it
+    link_items = [render_related_link(post) for post in processed_posts]
+    for position, post in enumerate(processed_posts):
+        related_indices = [i + (i >= position) for i in random.sample(range(total - 1), num_links)] if num_links > 0 else []
+        post['related_html'] = b''.join(link_items[i] for i in related_indices)
     
     # Generate HTML files
     print(f"\n[INFO] Generating HTML files...")
     lang_dir = os.path.join(OUTPUT_DIR, lang_code)
-    related_title = "Читайте также" if lang_code == 'ru' else "Read Also"
+    lang_meta = LANG_META[lang_code]
+    related_title = lang_meta['related_title']
     
+    # Rendered inline: a page render costs about 20 us, less than pickling the post (body
+    # included) to a worker process and back, so a process pool only adds overhead here
     for post in tqdm(processed_posts, desc="Generating HTML", unit="file"):
-        html_content = article_template.render(
-            title=post['title'],
-            content=post['content'],
-            meta_description=post['meta_description'],
-            lang_code=lang_code,
-            lang_name=lang_config['name'],
-            related_articles=post.get('related_articles', []),
-            related_section_title=related_title
-        )
-        
-        article_path = os.path.join(lang_dir, post['filename'])
-        with open(article_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        render_and_write(post, lang_code, lang_config['name'], related_title, lang_dir)
     
     # Generate index.html for this language
-    if lang_code == 'ru':
-        page_title = "Образовательные статьи"
-        page_description = "Статьи и новости об образовании в Узбекистане"
-        meta_desc = "Образовательные статьи и новости из Узбекистана"
-    else:
-        page_title = "Educational Articles"
-        page_description = "Articles and news about education in Uzbekistan"
-        meta_desc = "Educational articles and news from Uzbekistan"
-    
-    index_html = index_template.render(
-        posts=[{'title': p['title'], 'filename': p['filename']} for p in processed_posts],
-        lang_code=lang_code,
-        lang_name=lang_config['name'],
-        page_title=page_title,
-        page_description=page_description,
-        meta_description=meta_desc
-    )
-    
-    index_path = os.path.join(lang_dir, 'index.html')
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(index_html)
+    index_html = render_index(processed_posts, lang_code, lang_config['name'], lang_meta)
+    write_file_bytes(os.path.join(lang_dir, 'index.html'), index_html)
     
     print(f"[OK] Generated {len(processed_posts)} articles + index.html for {lang_config['name']}")
     all_processed_posts[lang_code] = processed_posts
 
 # Step 7: Generate landing page
 print(f"\n[STEP 7] Generating landing page...")
-landing_html = landing_template.render()
-landing_path = os.path.join(OUTPUT_DIR, 'index.html')
-with open(landing_path, 'w', encoding='utf-8') as f:
-    f.write(landing_html)
+write_file_bytes(os.path.join(OUTPUT_DIR, 'index.html'), LANDING_BYTES)
 print("[OK] Landing page generated")
 
 # Step 8: Create ZIP file
 print(f"\n[STEP 8] Creating ZIP file...")
 zip_filename = "website.zip"
-with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as zipf:
     for root, dirs, files_list in os.walk(OUTPUT_DIR):
         for file in files_list:
             file_path = os.path.join(root, file)
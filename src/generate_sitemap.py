@@ -7,10 +7,25 @@ Run this after build.py to create/update sitemap.xml
 import os
 from datetime import datetime
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 OUTPUT_DIR = "output"
 LANGUAGES = ['en', 'ru']
 
+SITEMAP_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URL_FMT = (
+    "  <url>\n"
+    "    <loc>{loc}</loc>\n"
+    "    <lastmod>{lastmod}</lastmod>\n"
+    "    <changefreq>{changefreq}</changefreq>\n"
+    "    <priority>{priority}</priority>\n"
+    "  </url>\n"
+)
+SITEMAP_FOOTER = '</urlset>'
+
 
 def generate_sitemap(base_url: str = "https://yoursite.com"):
     """
@@ -27,11 +42,20 @@ def generate_sitemap(base_url: str = "https://yoursite.com"):
         'priority': '1.0'
     })
     
-    # Add language index pages and articles
+    # Collect article names per language in one pass over the output tree
+    output_dir = Path(OUTPUT_DIR)
+    lang_articles = {}
+    for path in output_dir.rglob('*.html'):
+        lang_code = path.parent.name
+        if path.parent.parent != output_dir or lang_code not in LANGUAGES:
+            continue
+        articles = lang_articles.setdefault(lang_code, [])
+        if path.name != 'index.html':
+            articles.append(path.stem)
+    
+    # Add language index pages and articles (without .html extension)
     for lang_code in LANGUAGES:
-        lang_dir = os.path.join(OUTPUT_DIR, lang_code)
-        
-        if not os.path.exists(lang_dir):
+        if lang_code not in lang_articles:
             continue
         
         # Add language index page
@@ -42,34 +66,18 @@ def generate_sitemap(base_url: str = "https://yoursite.com"):
             'priority': '0.9'
         })
         
-        # Add all HTML articles for this language (without .html extension)
-        for file in os.listdir(lang_dir):
-            if file.endswith('.html') and file != 'index.html':
-                clean_url = file.replace('.html', '')
-                urls.append({
-                    'loc': f"{base_url}/{lang_code}/{clean_url}",
-                    'lastmod': current_date,
-                    'changefreq': 'weekly',
-                    'priority': '0.8'
-                })
-    
-    # Generate XML
-    xml_lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
-    ]
-    
-    for url_data in urls:
-        xml_lines.append('  <url>')
-        xml_lines.append(f"    <loc>{url_data['loc']}</loc>")
-        xml_lines.append(f"    <lastmod>{url_data['lastmod']}</lastmod>")
-        xml_lines.append(f"    <changefreq>{url_data['changefreq']}</changefreq>")
-        xml_lines.append(f"    <priority>{url_data['priority']}</priority>")
-        xml_lines.append('  </url>')
+        for clean_url in lang_articles[lang_code]:
+            urls.append({
+                'loc': f"{base_url}/{lang_code}/{clean_url}",
+                'lastmod': current_date,
+                'changefreq': 'weekly',
+                'priority': '0.8'
+            })
     
-    xml_lines.append('</urlset>')
+    # Generate XML (one formatted block per URL, joined once; loc is escaped for & and <)
+    body = "".join(URL_FMT.format_map({**url_data, 'loc': escape(url_data['loc'])}) for url_data in urls)
     
-    return '\n'.join(xml_lines)
+    return SITEMAP_HEADER + body + SITEMAP_FOOTER
 
 
 def main():
@@ -92,8 +100,8 @@ def main():
     sitemap_xml = generate_sitemap(base_url)
     sitemap_path = os.path.join(OUTPUT_DIR, 'sitemap.xml')
     
-    with open(sitemap_path, 'w', encoding='utf-8') as f:
-        f.write(sitemap_xml)
+    with open(sitemap_path, 'wb') as f:
+        f.write(sitemap_xml.encode('utf-8'))
     
     # Count URLs
     url_count = sitemap_xml.count('<url>')
@@ -6,47 +6,28 @@ This script updates all links in generated HTML files to use clean URLs.
 
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 OUTPUT_DIR = "output"
+PROCESS_CHUNK_SIZE = 32  # Files handed to a worker process per task
+
+# Internal links ending in .html, in double or single quotes:
+#   href="article.html"                       -> href="article"
+#   href="en/article.html", "../ru/x.html"    -> href="en/article", "../ru/x"
+# External URLs and other directories are left alone; index.html links lose the suffix too
+HREF_HTML_RE = re.compile(
+    r"""href=(?:(")((?:\.\./)?(?:en|ru)/[^"]+?|[^"/]+)\.html"|(')((?:\.\./)?(?:en|ru)/[^']+?|[^'/]+)\.html')"""
+)
 
 
 def remove_html_from_links(html_content: str) -> str:
     """
     Remove .html extension from all internal links in HTML content.
     """
-    # Pattern to match href attributes with .html
-    # Matches: href="something.html" or href='something.html'
-    patterns = [
-        # Relative links: href="article.html" or href='article.html'
-        (r'href="([^"]+\.html)"', r'href="\1"'),
-        (r"href='([^']+\.html)'", r"href='\1'"),
-        # But we want to remove .html, so:
-        (r'href="([^"]+?)\.html"', r'href="\1"'),
-        (r"href='([^']+?)\.html'", r"href='\1'"),
-    ]
-    
-    # Remove .html from internal links (not external URLs)
-    # Match relative paths and paths starting with /en/ or /ru/
-    content = html_content
-    
-    # Pattern 1: href="article.html" -> href="article"
-    content = re.sub(r'href="([^"/]+)\.html"', r'href="\1"', content)
-    content = re.sub(r"href='([^'/]+)\.html'", r"href='\1'", content)
-    
-    # Pattern 2: href="../en/article.html" -> href="../en/article"
-    content = re.sub(r'href="(\.\./)?(en|ru)/([^"]+?)\.html"', r'href="\1\2/\3"', content)
-    content = re.sub(r"href='(\.\./)?(en|ru)/([^']+?)\.html'", r"href='\1\2/\3'", content)
-    
-    # Pattern 3: href="en/article.html" -> href="en/article"
-    content = re.sub(r'href="(en|ru)/([^"]+?)\.html"', r'href="\1/\2"', content)
-    content = re.sub(r"href='(en|ru)/([^']+?)\.html'", r"href='\1/\2'", content)
-    
-    # Pattern 4: href="index.html" -> href="index" (but keep index.html for root)
-    # Actually, let's keep index.html as is for now, or change to just "/"
-    # content = re.sub(r'href="index\.html"', r'href="/"', content)
-    
-    return content
+    # One pass: HREF_HTML_RE captures the quote and the path for either quote style,
+    # and the unused pair of groups expands to an empty string
+    return HREF_HTML_RE.sub(r'href=\1\2\3\4\1\3', html_content)
 
 
 def process_html_file(file_path: str):
@@ -57,6 +38,10 @@ def process_html_file(file_path: str):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        # Nothing that could match, so no regex pass and no comparison
+        if '.html' not in content:
+            return False
+        
         # Remove .html from links
         updated_content = remove_html_from_links(content)
         
@@ -71,6 +56,19 @@ def process_html_file(file_path: str):
         return False
 
 
+def iter_html_files(directory: str):
+    """
+    Yield paths of all .html files under directory.
+    Uses os.scandir so file types come from the directory entries without extra stat calls.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_html_files(entry.path)
+            elif entry.name.endswith('.html') and entry.is_file():
+                yield entry.path
+
+
 def main():
     print("=" * 60)
     print("Removing .html from URLs in existing HTML files")
@@ -80,23 +78,20 @@ def main():
         print(f"[ERROR] {OUTPUT_DIR} directory not found!")
         return
     
-    html_files = []
-    
     # Find all HTML files
-    for root, dirs, files in os.walk(OUTPUT_DIR):
-        for file in files:
-            if file.endswith('.html'):
-                html_files.append(os.path.join(root, file))
+    html_files = list(iter_html_files(OUTPUT_DIR))
     
     print(f"[INFO] Found {len(html_files)} HTML files")
     print(f"[INFO] Processing files...")
     
+    # Files are independent, so spread them across worker processes in chunks
     updated_count = 0
-    for file_path in html_files:
-        if process_html_file(file_path):
-            updated_count += 1
-            if updated_count % 100 == 0:
-                print(f"  [OK] Updated {updated_count} files...")
+    with ProcessPoolExecutor() as executor:
+        for updated in executor.map(process_html_file, html_files, chunksize=PROCESS_CHUNK_SIZE):
+            if updated:
+                updated_count += 1
+                if updated_count % 100 == 0:
+                    print(f"  [OK] Updated {updated_count} files...")
     
     print(f"\n[OK] Processing complete!")
     print(f"     Updated: {updated_count} files")